@@ -2,9 +2,8 @@
 
 from __future__ import annotations
 
-from itertools import product
-from math import ceil, floor
-from typing import Any, Optional, Union
+from itertools import permutations
+from typing import Any
 
 from advent_of_code.checks import check_answer, check_example
 from advent_of_code.cli_output import print_single_answer
@@ -15,66 +14,76 @@ PI = PuzzleInfo(day=18, title="Snailfish")
 
 
 class SFNum:
-    """Represent a snailfish number as an 'ordered' tree."""
+    """Represent a snailfish number as flat lists of regular numbers.
 
-    parent: Optional[SFNum]
-    left: Union[int, SFNum]
-    right: Union[int, SFNum]
+    The regular numbers are stored left-to-right in two parallel lists: their values and
+    their depths, the number of pairs each value is nested within. This is all that is
+    needed to reduce a snailfish number and calculate its magnitude.
+    """
+
+    __slots__ = ("depths", "values")
+
+    depths: list[int]
+    values: list[int]
 
-    def __init__(
-        self, parent: Optional[SFNum], left: Union[int, SFNum], right: Union[int, SFNum]
-    ) -> None:
+    def __init__(self, depths: list[int], values: list[int]) -> None:
         """Create a snailfish number object.
 
         Args:
-            parent (Optional[SFNum]): The parent, if any, of this snailfish number pair.
-            left (Union[int, SFNum]): Left value.
-            right (Union[int, SFNum]): Right value.
+            depths (list[int]): Depth of each regular number.
+            values (list[int]): Value of each regular number.
         """
-        self.parent = parent
-        self.left = left
-        self.right = right
+        assert len(depths) == len(values)
+        self.depths = depths
+        self.values = values
         return None
 
     def __eq__(self, right: Any) -> bool:
         """Equate two snailfish numbers."""
+        if isinstance(right, SFNum):
+            return self.depths == right.depths and self.values == right.values
         return str(self) == str(right)
 
     def __add__(self, right: SFNum) -> SFNum:
         """Add two snailfish numbers together."""
-        return SFNum(parent=None, left=self, right=right)
+        depths = [d + 1 for d in self.depths + right.depths]
+        return SFNum(depths=depths, values=self.values + right.values)
 
     def __str__(self) -> str:
         """Human-readable representation."""
-        return f"[{self.left},{self.right}]"
+        stack: list[tuple[int, str]] = []
+        for depth, value in zip(self.depths, self.values):
+            item = str(value)
+            while stack and stack[-1][0] == depth:
+                item = f"[{stack.pop()[1]},{item}]"
+                depth -= 1
+            stack.append((depth, item))
+        return stack[0][1]
 
     def __repr__(self) -> str:
         """Human-readable representation."""
         return str(self)
 
 
-def _list_to_snailfish_number(data: list[Any], parent: Optional[SFNum] = None) -> SFNum:
-    assert len(data) == 2
-    sf_num = SFNum(parent=parent, left=-1, right=-1)
-    left_data = data[0]
-    right_data = data[1]
-
-    if isinstance(left_data, int):
-        sf_num.left = left_data
-    else:
-        sf_num.left = _list_to_snailfish_number(left_data, parent=sf_num)
-
-    if isinstance(right_data, int):
-        sf_num.right = right_data
-    else:
-        sf_num.right = _list_to_snailfish_number(right_data, parent=sf_num)
-
-    return sf_num
-
-
 def parse_snailfish_number(data: str) -> SFNum:
     """Parse a string into snailfish data."""
-    return _list_to_snailfish_number(eval(data))
+    depths: list[int] = []
+    values: list[int] = []
+    depth = 0
+    value = -1
+    for char in data.strip():
+        if char == "[":
+            depth += 1
+        elif char == "," or char == "]":
+            if value >= 0:
+                depths.append(depth)
+                values.append(value)
+                value = -1
+            if char == "]":
+                depth -= 1
+        elif char.isdigit():
+            value = max(value, 0) * 10 + int(char)
+    return SFNum(depths=depths, values=values)
 
 
 def parse_snailfish_numbers(data: str) -> list[SFNum]:
@@ -121,139 +130,96 @@ def _get_puzzle_snailfish_numbers() -> list[SFNum]:
     return parse_snailfish_numbers(read_data(PI.day))
 
 
-def split(sf_num: SFNum) -> SFNum:
-    """Split a snailfish number as a part of the reducing process.
+def split(sf_num: SFNum) -> bool:
+    """Split a snailfish number (in place) as a part of the reducing process.
 
     Args:
         sf_num (SFNum): Snailfish number.
 
     Returns:
-        SFNum: Updated number.
+        bool: Whether a regular number was split.
     """
-    sf_num_0: str = str(sf_num)
-
-    if isinstance(sf_num.left, SFNum):
-        sf_num.left = split(sf_num.left)
-    elif sf_num.left >= 10:
-        x = sf_num.left
-        sf_num.left = SFNum(parent=sf_num, left=floor(x / 2), right=ceil(x / 2))
+    for i, value in enumerate(sf_num.values):
+        if value >= 10:
+            depth = sf_num.depths[i] + 1
+            sf_num.depths[i : i + 1] = (depth, depth)
+            sf_num.values[i : i + 1] = (value // 2, (value + 1) // 2)
+            return True
+    return False
 
-    if str(sf_num) != sf_num_0:
-        return sf_num
-
-    if isinstance(sf_num.right, SFNum):
-        sf_num.right = split(sf_num.right)
-    elif sf_num.right >= 10:
-        x = sf_num.right
-        sf_num.right = SFNum(parent=sf_num, left=floor(x / 2), right=ceil(x / 2))
-
-    return sf_num
-
-
-def _add_to_first_left_value_going_down(sf_num: SFNum, value: int) -> None:
-    if isinstance(sf_num.left, int):
-        sf_num.left += value
-    else:
-        _add_to_first_left_value_going_down(sf_num.left, value)
-    return None
-
-
-def _add_to_first_right_value_going_down(sf_num: SFNum, value: int) -> None:
-    if isinstance(sf_num.right, int):
-        sf_num.right += value
-    else:
-        _add_to_first_right_value_going_down(sf_num.right, value)
-    return None
 
-
-def _add_to_first_value_to_the_right(sf_num: SFNum, value: int) -> None:
-    if sf_num.parent is None:
-        return None
-    elif isinstance(sf_num.parent.right, int):
-        sf_num.parent.right += value
-    elif sf_num.parent.right is not sf_num:
-        _add_to_first_left_value_going_down(sf_num.parent.right, value)
-    else:
-        _add_to_first_value_to_the_right(sf_num.parent, value)
-    return None
-
-
-def _add_to_first_value_to_the_left(sf_num: SFNum, value: int) -> None:
-    if sf_num.parent is None:
-        return None
-    elif isinstance(sf_num.parent.left, int):
-        sf_num.parent.left += value
-    elif sf_num.parent.left is not sf_num:
-        _add_to_first_right_value_going_down(sf_num.parent.left, value)
-    else:
-        _add_to_first_value_to_the_left(sf_num.parent, value)
-    return None
-
-
-def explode(sf_num: SFNum, layer: int = 1) -> SFNum:
-    """Explode a snailfish number as a part of the reducing process.
+def explode(sf_num: SFNum) -> bool:
+    """Explode a snailfish number (in place) as a part of the reducing process.
 
     Args:
         sf_num (SFNum): Snailfish number.
-        layer (int, optional): Current layer of the number. Defaults to 1.
 
     Returns:
-        SFNum: Updated snailfish number.
+        bool: Whether a pair was exploded.
     """
-    sf_num_0: str = str(sf_num)
-
-    if layer == 4:
-        if isinstance(sf_num.left, SFNum):
-            left_val, right_val = sf_num.left.left, sf_num.left.right
-            assert isinstance(left_val, int) and isinstance(right_val, int)
-            if isinstance(sf_num.right, int):
-                sf_num.right += right_val
-            else:
-                assert isinstance(sf_num.right.left, int)
-                sf_num.right.left += right_val
-            _add_to_first_value_to_the_left(sf_num, left_val)
-            sf_num.left = 0
-            return sf_num
-        elif isinstance(sf_num.right, SFNum):
-            left_val, right_val = sf_num.right.left, sf_num.right.right
-            assert isinstance(left_val, int) and isinstance(right_val, int)
-            if isinstance(sf_num.left, int):
-                sf_num.left += left_val
-            else:
-                assert isinstance(sf_num.left.right, int)
-                sf_num.left.right += left_val
-            _add_to_first_value_to_the_right(sf_num, right_val)
-            sf_num.right = 0
-            return sf_num
-
-    if str(sf_num) != sf_num_0:
-        return sf_num
-
-    if isinstance(sf_num.left, SFNum):
-        explode(sf_num.left, layer + 1)
-
-    if str(sf_num) != sf_num_0:
-        return sf_num
-
-    if isinstance(sf_num.right, SFNum):
-        explode(sf_num.right, layer + 1)
+    depths, values = sf_num.depths, sf_num.values
+    # Reduced numbers are never nested more than 4 deep, so after an addition the
+    # first pair to explode is the first regular number at depth 5.
+    try:
+        i = depths.index(5)
+    except ValueError:
+        return False
+    assert depths[i + 1] == 5
+    if i > 0:
+        values[i - 1] += values[i]
+    if i + 2 < len(values):
+        values[i + 2] += values[i + 1]
+    depths[i : i + 2] = (4,)
+    values[i : i + 2] = (0,)
+    return True
 
-    return sf_num
 
+def reduce_snailfish_number(sf_num: SFNum) -> SFNum:
+    """Reduce a snailfish number (in place).
 
-def _rebuild_snailfish_number(sf_num: SFNum) -> SFNum:
-    return parse_snailfish_number(str(sf_num))
+    This is equivalent to repeatedly calling `explode()` then `split()` until neither
+    changes the number, but it avoids re-scanning the number from the start each time.
+    First, every pair nested too deeply by the addition is exploded in a single
+    left-to-right pass. Then a cursor moves along the values splitting any that are too
+    large, immediately exploding the new pair if it is nested too deeply. Everything to
+    the left of the cursor is always fully reduced.
 
+    Args:
+        sf_num (SFNum): Snailfish number.
 
-def reduce_snailfish_number(sf_num: SFNum) -> SFNum:
-    """Reduce a snailfish number."""
-    sf_num_0: str = ""
-    while str(sf_num) != sf_num_0:
-        sf_num = _rebuild_snailfish_number(sf_num)
-        sf_num_0 = str(sf_num)
-        sf_num = explode(sf_num)
-        if str(sf_num) == sf_num_0:
-            sf_num = split(sf_num)
+    Returns:
+        SFNum: Reduced snailfish number.
+    """
+    depths, values = sf_num.depths, sf_num.values
+
+    i = 0
+    while i < len(depths):
+        if depths[i] == 5:
+            if i > 0:
+                values[i - 1] += values[i]
+            if i + 2 < len(values):
+                values[i + 2] += values[i + 1]
+            depths[i : i + 2] = (4,)
+            values[i : i + 2] = (0,)
+        i += 1
+
+    i = 0
+    while i < len(values):
+        value = values[i]
+        if value < 10:
+            i += 1
+            continue
+        depth = depths[i] + 1
+        if depth < 5:
+            depths[i : i + 1] = (depth, depth)
+            values[i : i + 1] = (value // 2, (value + 1) // 2)
+        else:
+            if i > 0:
+                values[i - 1] += value // 2
+            if i + 1 < len(values):
+                values[i + 1] += (value + 1) // 2
+            values[i] = 0
+            i = max(i - 1, 0)
     return sf_num
 
 
@@ -282,17 +248,20 @@ def snailfish_number_magnitude(sf_num: SFNum) -> int:
     Returns:
         int: Magnitude.
     """
-    if isinstance(sf_num.left, int):
-        left = sf_num.left
-    else:
-        left = snailfish_number_magnitude(sf_num.left)
+    # Whenever the top two items of the stack are at the same depth, they are the left
+    # and right halves of a single pair and can be combined.
+    stack: list[tuple[int, int]] = []
+    for depth, value in zip(sf_num.depths, sf_num.values):
+        while stack and stack[-1][0] == depth:
+            value = stack.pop()[1] * 3 + value * 2
+            depth -= 1
+        stack.append((depth, value))
+    assert len(stack) == 1 and stack[0][0] == 0
+    return stack[0][1]
 
-    if isinstance(sf_num.right, int):
-        right = sf_num.right
-    else:
-        right = snailfish_number_magnitude(sf_num.right)
 
-    return left * 3 + right * 2
+def _addition_magnitude(a: SFNum, b: SFNum) -> int:
+    return snailfish_number_magnitude(reduce_snailfish_number(a + b))
 
 
 def find_larget_magnitude(sf_nums: list[SFNum]) -> int:
@@ -304,15 +273,8 @@ def find_larget_magnitude(sf_nums: list[SFNum]) -> int:
     Returns:
         int: Larget magnitude.
     """
-    magnitudes: list[int] = []
-    for a, b in product(sf_nums, sf_nums):
-        if a == b:
-            continue
-        s1 = snailfish_number_magnitude(perform_addition([a, b]))
-        s2 = snailfish_number_magnitude(perform_addition([b, a]))
-        magnitudes.append(s1)
-        magnitudes.append(s2)
-    return max(magnitudes)
+    # Permutations visit both orders of each pair of different numbers.
+    return max(_addition_magnitude(a, b) for a, b in permutations(sf_nums, 2))
 
 
 def main() -> None:
@@ -328,20 +290,26 @@ def main() -> None:
     ex_added = ex_snail_nums[0] + ex_snail_nums[1]
     check_example(str(ex_added), "[[[[[4,3],4],4],[7,[[8,4],9]]],[1,1]]")
 
-    a = explode(parse_snailfish_number("[[[[[9,8],1],2],3],4]"))
+    a = parse_snailfish_number("[[[[[9,8],1],2],3],4]")
+    check_example(True, explode(a))
     check_example("[[[[0,9],2],3],4]", a)
-    b = explode(parse_snailfish_number("[7,[6,[5,[4,[3,2]]]]]"))
+    b = parse_snailfish_number("[7,[6,[5,[4,[3,2]]]]]")
+    check_example(True, explode(b))
     check_example("[7,[6,[5,[7,0]]]]", b)
-    ex_snail_num = parse_snailfish_number("[[6,[5,[4,[3,2]]]],1]")
-    c = explode(ex_snail_num)
+    c = parse_snailfish_number("[[6,[5,[4,[3,2]]]],1]")
+    check_example(True, explode(c))
     check_example("[[6,[5,[7,0]]],3]", c)
-    d = explode(parse_snailfish_number("[[[[0,7],4],[[7,8],[0,[6,7]]]],[1,1]]"))
+    d = parse_snailfish_number("[[[[0,7],4],[[7,8],[0,[6,7]]]],[1,1]]")
+    check_example(True, explode(d))
     check_example("[[[[0,7],4],[[7,8],[6,0]]],[8,1]]", d)
+    check_example(False, explode(d))
 
-    a = split(parse_snailfish_number("[[[[0,7],4],[15,[0,13]]],[1,1]]"))
+    a = parse_snailfish_number("[[[[0,7],4],[15,[0,13]]],[1,1]]")
+    check_example(True, split(a))
     check_example("[[[[0,7],4],[[7,8],[0,13]]],[1,1]]", a)
-    b = split(a)
-    check_example("[[[[0,7],4],[[7,8],[0,[6,7]]]],[1,1]]", b)
+    check_example(True, split(a))
+    check_example("[[[[0,7],4],[[7,8],[0,[6,7]]]],[1,1]]", a)
+    check_example(False, split(d))
 
     reduced_added = reduce_snailfish_number(ex_added)
     check_example("[[[[0,7],4],[[7,8],[6,0]]],[8,1]]", reduced_added)
@@ -2,134 +2,64 @@
 
 from __future__ import annotations
 
-from copy import deepcopy
-from enum import Enum
-from functools import cache
-from itertools import product
-from typing import Any
+from collections import Counter
+from itertools import combinations, permutations, product
+from typing import Optional
+
+import numpy as np
 
 from advent_of_code.checks import check_answer, check_example
 from advent_of_code.cli_output import print_single_answer
 from advent_of_code.data import read_data
-from advent_of_code.utils import PuzzleInfo, assert_never
+from advent_of_code.utils import PuzzleInfo
 
 PI = PuzzleInfo(day=19, title="Beacon Scanner")
 
+Beacon = tuple[int, int, int]
 
-class Axis(Enum):
-    """Available axes."""
-
-    X = "X"
-    Y = "Y"
-    Z = "Z"
-
-
-class Beacon:
-    """Location beacon."""
-
-    x: int
-    y: int
-    z: int
-
-    def __init__(self, x: int, y: int, z: int) -> None:
-        """Create a location beacon object."""
-        self.x, self.y, self.z = x, y, z
-        return None
-
-    def __str__(self) -> str:
-        """Human-readable representation."""
-        return f"({self.x}, {self.y}, {self.z})"
-
-    def __repr__(self) -> str:
-        """Human-readable representation."""
-        return str(self)
-
-    def __copy__(self) -> Beacon:
-        """Copy a beacon object to a new object."""
-        return Beacon(self.x, self.y, self.z)
 
-    def __eq__(self, b: Any) -> bool:
-        """Is this beacon equal to another."""
-        return self.x == b.x and self.y == b.y and self.z == b.z
+def _make_rotation_matrices() -> np.ndarray:
+    # The 24 orientations are the signed permutation matrices with determinant +1.
+    rotations: list[np.ndarray] = []
+    for perm in permutations(range(3)):
+        for signs in product((1, -1), repeat=3):
+            rot = np.zeros((3, 3), dtype=int)
+            rot[range(3), perm] = signs
+            if round(np.linalg.det(rot)) == 1:
+                rotations.append(rot)
+    assert len(rotations) == 24
+    return np.array(rotations)
 
-    def __hash__(self) -> int:
-        """Hash of this beacon."""
-        return hash((self.x, self.y, self.z))
-
-    def __getitem__(self, axis: Axis) -> int:
-        """Index a beacon's location values.
-
-        Args:
-            axis (Axis): Axis to retreive.
-
-        Returns:
-            int: Value along that axis.
-        """
-        if axis is Axis.X:
-            return self.x
-        elif axis is Axis.Y:
-            return self.y
-        elif axis is Axis.Z:
-            return self.z
-        else:
-            assert_never(axis)
-
-    def translate(self, x: int, y: int, z: int) -> None:
-        """Translate the beacon.
-
-        Args:
-            x (int): Change along the x-dimension.
-            y (int): Change along the y-dimension.
-            z (int): Change along the z-dimension.
-        """
-        self.x += x
-        self.y += y
-        self.z += z
-
-    def rotate_90(self, around_axis: Axis) -> None:
-        """Rotate a point 90 deg. around an axis.
-
-        Source:
-        https://stackoverflow.com/questions/14607640/rotating-a-vector-in-3d-space
-
-        Args:
-            around_axis (Axis): Axis to rotate around.
 
-        Raises:
-            BaseException: If the axis is unknown.
-        """
-        # sin(90) = 1  and  cos(90) = 0
-        x, y, z = self.x, self.y, self.z
-        if around_axis is Axis.X:
-            self.y = -z  # y cos θ − z sin θ
-            self.z = y  # y sin θ + z cos θ
-        elif around_axis is Axis.Y:
-            self.x = z  # x cos θ + z sin θ
-            self.z = -x  # −x sin θ + z cos θ
-        elif around_axis is Axis.Z:
-            self.x = -y  # x cos θ − y sin θ
-            self.y = x  # x sin θ + y cos θ
-        else:
-            assert_never(around_axis)
+ROTATIONS = _make_rotation_matrices()
 
 
 class Scanner:
     """Scanner sensor."""
 
+    __slots__ = ("id", "beacons", "center")
+
     id: str
-    beacons: list[Beacon]
-    center: Beacon
+    beacons: np.ndarray
+    center: np.ndarray
 
-    def __init__(self, id: str, beacons: list[Beacon]) -> None:
+    def __init__(
+        self, id: str, beacons: np.ndarray, center: Optional[np.ndarray] = None
+    ) -> None:
         """Create a scanner object.
 
+        Scanners are not modified in place: translating or rotating a scanner returns a
+        new scanner object.
+
         Args:
             id (str): Unique identifier.
-            beacons (list[Beacon]): List of detected beacons.
+            beacons (np.ndarray): Locations of the detected beacons (N x 3).
+            center (Optional[np.ndarray], optional): Location of the scanner. Defaults
+            to None for the origin.
         """
         self.id = id
-        self.beacons = deepcopy(beacons)
-        self.center = Beacon(0, 0, 0)
+        self.beacons = beacons
+        self.center = np.zeros(3, dtype=int) if center is None else center
         return None
 
     def __str__(self) -> str:
@@ -144,45 +74,45 @@ class Scanner:
 
     def __copy__(self) -> Scanner:
         """Make a duplicate object."""
-        return Scanner(self.id, beacons=deepcopy(self.beacons))
+        return Scanner(self.id, beacons=self.beacons, center=self.center)
 
     def __hash__(self) -> int:
         """Hash of this scanner object."""
-        return hash(f"{self.id} | {self.center} | {self.beacons}")
+        return hash(self.id)
 
-    def translate_beacons(self, x: int, y: int, z: int) -> None:
+    def translated(self, offset: np.ndarray) -> Scanner:
         """Translate the scanner and its beacons locations.
 
         Args:
-            x (int): Change along the x-dimension.
-            y (int): Change along the y-dimension.
-            z (int): Change along the z-dimension.
+            offset (np.ndarray): Change along the x, y, and z dimensions.
+
+        Returns:
+            Scanner: Translated scanner.
         """
-        self.center.translate(x=x, y=y, z=z)
-        for beacon in self.beacons:
-            beacon.translate(x=x, y=y, z=z)
+        return Scanner(
+            self.id, beacons=self.beacons + offset, center=self.center + offset
+        )
 
-    def rotate_beacons_90(self, around_axis: Axis) -> None:
-        """Rotate a scanner and its beacons aruond an axis.
+    def rotated(self, rot: np.ndarray) -> Scanner:
+        """Rotate a scanner and its beacons.
 
         Args:
-            around_axis (Axis): Axis to rotate around.
+            rot (np.ndarray): Rotation matrix (3 x 3).
+
+        Returns:
+            Scanner: Rotated scanner.
         """
-        self.center.rotate_90(around_axis=around_axis)
-        for beacon in self.beacons:
-            beacon.rotate_90(around_axis=around_axis)
-        return None
+        return Scanner(self.id, beacons=self.beacons @ rot.T, center=rot @ self.center)
 
 
-def _parse_single_scanner_data(data: str) -> list[Beacon]:
+def _parse_single_scanner_data(data: str) -> np.ndarray:
     split_data = data.strip().splitlines()
     title_line = split_data.pop(0)
     assert "scanner" in title_line
-    beacons: list[Beacon] = []
-    for pt in split_data:
-        xyz: tuple[int, ...] = tuple([int(x) for x in pt.strip().split(",")])
-        assert len(xyz) == 3
-        beacons.append(Beacon(*xyz))
+    beacons = np.array(
+        [[int(x) for x in pt.strip().split(",")] for pt in split_data], dtype=int
+    )
+    assert beacons.shape[1] == 3
     return beacons
 
 
@@ -205,6 +135,10 @@ def _get_puzzle_data() -> list[Scanner]:
     return parse_scanner_data(data)
 
 
+def _beacon_set(scanner: Scanner) -> set[Beacon]:
+    return {(x, y, z) for x, y, z in scanner.beacons.tolist()}
+
+
 def get_overlapping_beacons(s1: Scanner, s2: Scanner) -> set[Beacon]:
     """Get the set of beacons shared by two scanners.
 
@@ -215,9 +149,7 @@ def get_overlapping_beacons(s1: Scanner, s2: Scanner) -> set[Beacon]:
     Returns:
         set[Beacon]: Set of shared beacons.
     """
-    b1 = set(s1.beacons)
-    b2 = set(s2.beacons)
-    return b1.intersection(b2)
+    return _beacon_set(s1).intersection(_beacon_set(s2))
 
 
 def count_overlapping_beacons(s1: Scanner, s2: Scanner) -> int:
@@ -233,34 +165,64 @@ def count_overlapping_beacons(s1: Scanner, s2: Scanner) -> int:
     return len(get_overlapping_beacons(s1, s2))
 
 
-def _try_rotations(s1: Scanner, s2: Scanner) -> bool:
-    for _ in range(4):
-        s2.rotate_beacons_90(Axis.X)
-        for _ in range(4):
-            s2.rotate_beacons_90(Axis.Y)
-            for _ in range(4):
-                s2.rotate_beacons_90(Axis.Z)
-                if count_overlapping_beacons(s1, s2) >= 12:
-                    return True
-    return False
+_PACK_BASE = 1 << 20
 
 
-def _recenter_scanners(s1: Scanner, s2: Scanner) -> None:
-    s = deepcopy(s1.center)
-    s1.translate_beacons(-s.x, -s.y, -s.z)
-    s2.translate_beacons(-s.x, -s.y, -s.z)
+def _pack_beacons(beacons: np.ndarray) -> np.ndarray:
+    # Packing is linear, so the difference of two packed beacons is their packed
+    # difference. Keys are unique while coordinates (and differences) are within 2^19.
+    return beacons @ np.array([_PACK_BASE * _PACK_BASE, _PACK_BASE, 1])
+
+
+def _find_alignment(
+    beacons_1: np.ndarray, beacons_2: np.ndarray
+) -> Optional[tuple[np.ndarray, np.ndarray]]:
+    packed_1 = _pack_beacons(beacons_1)
+    # The rotated x-coordinates are always one of the original axes, possibly negated,
+    # so a cheap vote on just the x-coordinates can rule out most rotations.
+    x_may_align: dict[tuple[int, int], bool] = {}
+    for rot in ROTATIONS:
+        axis = int(np.flatnonzero(rot[0])[0])
+        sign = int(rot[0, axis])
+        if (axis, sign) not in x_may_align:
+            dx = beacons_1[:, 0, None] - sign * beacons_2[None, :, axis]
+            _, x_counts = np.unique(dx, return_counts=True)
+            x_may_align[(axis, sign)] = x_counts.max() >= 12
+        if not x_may_align[(axis, sign)]:
+            continue
+        # Every pair of beacons votes for the translation that would align them; the
+        # scanners overlap if at least 12 pairs agree on the same translation.
+        rotated = beacons_2 @ rot.T
+        diffs = packed_1[:, None] - _pack_beacons(rotated)[None, :]
+        keys, counts = np.unique(diffs, return_counts=True)
+        i = counts.argmax()
+        if counts[i] >= 12:
+            b1, b2 = np.unravel_index(np.argmax(diffs == keys[i]), diffs.shape)
+            return rot, beacons_1[b1] - rotated[b2]
     return None
 
 
-@cache
+def _try_rotations(s1: Scanner, s2: Scanner) -> Optional[Scanner]:
+    alignment = _find_alignment(s1.beacons, s2.beacons)
+    if alignment is None:
+        return None
+    rot, offset = alignment
+    return s2.rotated(rot).translated(offset)
+
+
+def _recenter_scanners(s1: Scanner, s2: Scanner) -> tuple[Scanner, Scanner]:
+    return s1.translated(-s1.center), s2.translated(-s1.center)
+
+
 def find_overlap_between_scanners(
     scanner_1: Scanner, scanner_2: Scanner
 ) -> tuple[Scanner, Scanner, bool]:
     """Search for the overlap of two scanners.
 
-    The algorithm works by iterating over the beacons. For each pair, the scanners and
-    their beacons are translated such that the two beacons are at the origin (0,0). Then
-    all possible rotations are attempted until at least 12 beacons overlap.
+    The algorithm works by iterating over the possible rotations of the second scanner.
+    For each rotation, the difference between every pair of beacons across the two
+    scanners is computed and the most common difference is the best translation. The
+    scanners overlap if at least 12 pairs of beacons agree on this translation.
 
     Args:
         scanner_1 (Scanner): Scanner 1.
@@ -270,31 +232,32 @@ def find_overlap_between_scanners(
         tuple[Scanner, Scanner, bool]: The final scanners and whether or not a
         satisfactory overlap was found.
     """
-    for b1, b2 in product(scanner_1.beacons, scanner_2.beacons):
-        s1 = deepcopy(scanner_1)
-        s2 = deepcopy(scanner_2)
-        s1.translate_beacons(-b1.x, -b1.y, -b1.z)
-        s2.translate_beacons(-b2.x, -b2.y, -b2.z)
-        assert count_overlapping_beacons(s1, s2) > 0
-        res = _try_rotations(s1, s2)
-        if res:
-            _recenter_scanners(s1, s2)
-            return s1, s2, True
-    return scanner_1, scanner_2, False
-
-
-def _remove_solved_scanners_from_remaining_list(
-    solved: list[Scanner], scanners: list[Scanner]
-) -> list[Scanner]:
-    solved_ids = set([s.id for s in solved])
-    return [s for s in scanners if s.id not in solved_ids]
+    s2 = _try_rotations(scanner_1, scanner_2)
+    if s2 is None:
+        return scanner_1, scanner_2, False
+    s1, s2 = _recenter_scanners(scanner_1, s2)
+    return s1, s2, True
+
+
+def _distance_fingerprint(beacons: np.ndarray) -> Counter[int]:
+    # Squared distances between the beacons of a scanner do not change with rotation
+    # or translation, so 12 shared beacons means at least 66 (12 choose 2) shared
+    # distances.
+    dists = ((beacons[:, None, :] - beacons[None, :, :]) ** 2).sum(axis=-1)
+    return Counter(dists[np.triu_indices(len(beacons), k=1)].tolist())
+
+
+def _may_overlap(fingerprint_1: Counter[int], fingerprint_2: Counter[int]) -> bool:
+    return sum((fingerprint_1 & fingerprint_2).values()) >= 66
 
 
 def solve_overlapping_scanners(scanners: list[Scanner]) -> list[Scanner]:
     """Solve the orientations of overallping scanners.
 
-    First, a pair of scanners is found with satisfactory overlap. Then, the remaining
-    scanners are added to those seeds until all scanners have been added.
+    The first scanner is used as the reference frame. Each newly solved scanner is then
+    used as a seed to solve any of the remaining scanners it overlaps with until all
+    scanners have been added. Pairs of scanners that do not share enough
+    beacon-to-beacon distances are skipped without attempting to align them.
 
     Args:
         scanners (list[Scanner]): List of scanners.
@@ -302,39 +265,25 @@ def solve_overlapping_scanners(scanners: list[Scanner]) -> list[Scanner]:
     Returns:
         list[Scanner]: Re-oriented scanners such that they form a contiguous network.
     """
-    scanners = deepcopy(scanners)
-    solved_scanners: list[Scanner] = []
-    s1 = scanners[0]
-    for s2 in scanners:
-        if s1.id == s2.id:
-            continue
-        s1, s2, res = find_overlap_between_scanners(s1, s2)
-        if res:
-            print(f"first solved: {s1.id} - {s2.id}")
-            solved_scanners.append(deepcopy(s1))
-            solved_scanners.append(deepcopy(s2))
-            break
-
-    assert len(solved_scanners) == 2
-    scanners = _remove_solved_scanners_from_remaining_list(
-        solved=solved_scanners, scanners=scanners
-    )
-
-    while len(scanners) > 0:
-        print(f"num scanners left: {len(scanners)}")
-        for seed_scanner, s2 in product(solved_scanners, scanners):
+    fingerprints = {s.id: _distance_fingerprint(s.beacons) for s in scanners}
+    remaining = {s.id: s for s in scanners[1:]}
+    solved_scanners: list[Scanner] = [scanners[0]]
+    seeds: list[Scanner] = [scanners[0]]
+
+    while seeds and remaining:
+        seed_scanner = seeds.pop()
+        for s2 in list(remaining.values()):
+            if not _may_overlap(fingerprints[seed_scanner.id], fingerprints[s2.id]):
+                continue
             _, s2, res = find_overlap_between_scanners(seed_scanner, s2)
             if res:
-                c = deepcopy(seed_scanner.center)
-                s2.translate_beacons(c.x, c.y, c.z)
+                s2 = s2.translated(seed_scanner.center)
                 assert count_overlapping_beacons(seed_scanner, s2) >= 12
-                print(f"solved: {seed_scanner.id} - {s2.id}")
-                solved_scanners.append(deepcopy(s2))
-                scanners = _remove_solved_scanners_from_remaining_list(
-                    solved=solved_scanners, scanners=scanners
-                )
-                break
+                del remaining[s2.id]
+                solved_scanners.append(s2)
+                seeds.append(s2)
 
+    assert not remaining, f"Unable to solve scanners: {list(remaining.keys())}"
     return solved_scanners
 
 
@@ -349,7 +298,7 @@ def unique_beacons(scanners: list[Scanner]) -> set[Beacon]:
     """
     beacons: set[Beacon] = set()
     for s in scanners:
-        beacons = beacons.union(s.beacons)
+        beacons.update(_beacon_set(s))
     return beacons
 
 
@@ -374,14 +323,12 @@ def maximum_manhattan_distance(scanners: list[Scanner]) -> int:
     Returns:
         int: Maximum Manhattan distance.
     """
-    dists: list[int] = []
-    for s1, s2 in product(scanners, scanners):
-        if s1 is s2:
-            continue
-        c1, c2 = deepcopy(s1.center), deepcopy(s2.center)
-        diffs = [c1.x - c2.x, c1.y - c2.y, c1.z - c2.z]
-        dists.append(sum([abs(a) for a in diffs]))
-    return max(dists)
+    centers = [s.center.tolist() for s in scanners]
+    # The distance is symmetric so each pair of scanners only needs checking once.
+    return max(
+        abs(x1 - x2) + abs(y1 - y2) + abs(z1 - z2)
+        for (x1, y1, z1), (x2, y2, z2) in combinations(centers, 2)
+    )
 
 
 def main() -> None:
@@ -1,12 +1,12 @@
 """Day 20: Trench Map."""
 
-from itertools import product
 from pathlib import Path
 from typing import Optional
 
 import matplotlib.pyplot as plt
 import numpy as np
 from matplotlib.animation import FuncAnimation, PillowWriter
+from matplotlib.artist import Artist
 
 from advent_of_code.checks import check_answer, check_example
 from advent_of_code.cli_output import print_single_answer
@@ -16,35 +16,33 @@ from advent_of_code.utils import PuzzleInfo
 PI = PuzzleInfo(day=20, title="Trench Map")
 
 
-def parse_data(data: str) -> tuple[list[bool], np.ndarray]:
+def parse_data(data: str) -> tuple[np.ndarray, np.ndarray]:
     """Parse puzzle input into the enhancement algorithm and starting image.
 
     Args:
         data (str): Raw data as a string.
 
     Returns:
-        tuple[list[bool], np.ndarray]: Enhancement algorithm and starting image.
+        tuple[np.ndarray, np.ndarray]: Enhancement algorithm as a 512-entry uint8
+        lookup table and starting image.
     """
     split_data = data.strip().splitlines()
-    algorithm = [x == "#" for x in split_data.pop(0).strip()]
+    alg_line = split_data.pop(0).strip().encode()
+    algorithm = (np.frombuffer(alg_line, dtype=np.uint8) == ord("#")).astype(np.uint8)
     assert len(algorithm) == 512
     _blank = split_data.pop(0).strip()
     assert len(_blank) == 0
-    rows: list[list[str]] = []
-    for line in split_data:
-        rows.append(list(line.strip()))
-    ary = np.array(rows)
-    ary[ary == "#"] = 1
-    ary[ary == "."] = 0
-    ary = ary.astype(bool)
+    rows = [line.strip() for line in split_data]
+    pixels = np.frombuffer("".join(rows).encode(), dtype=np.uint8)
+    ary = pixels.reshape(len(rows), -1) == ord("#")
     return algorithm, ary
 
 
-def _get_example_input() -> tuple[list[bool], np.ndarray]:
+def _get_example_input() -> tuple[np.ndarray, np.ndarray]:
     return parse_data(read_data(PI.day, name="example-input.txt"))
 
 
-def _get_puzzle_input() -> tuple[list[bool], np.ndarray]:
+def _get_puzzle_input() -> tuple[np.ndarray, np.ndarray]:
     return parse_data(read_data(PI.day))
 
 
@@ -77,14 +75,25 @@ def plot_video(imgs: list[np.ndarray], video_path: Optional[Path] = None) -> Non
         video_path (Optional[Path], optional): If supplied, the video will be saved to
         file instead of shown in-real-time. Defaults to None.
     """
+    # Frames differ in size, so each is centered within the largest one.
+    height = max(img.shape[0] for img in imgs)
+    width = max(img.shape[1] for img in imgs)
     fig, ax = plt.subplots()
-
-    def _update(i: int) -> None:
-        ax.imshow(imgs[i], cmap="binary")
-        ax.set_title(f"frame {i}")
-        return None
-
-    ani = FuncAnimation(fig, _update, len(imgs))
+    im = ax.imshow(imgs[0], cmap="binary", vmin=0, vmax=1, animated=True)
+    ax.set_xlim(-0.5, width - 0.5)
+    ax.set_ylim(height - 0.5, -0.5)
+    title = ax.set_title("frame 0")
+
+    def _update(i: int) -> tuple[Artist, ...]:
+        img = imgs[i]
+        top = (height - img.shape[0]) // 2 - 0.5
+        left = (width - img.shape[1]) // 2 - 0.5
+        im.set_data(img)
+        im.set_extent((left, left + img.shape[1], top + img.shape[0], top))
+        title.set_text(f"frame {i}")
+        return im, title
+
+    ani = FuncAnimation(fig, _update, len(imgs), blit=True)
     if video_path is None:
         plt.show()
     else:
@@ -100,71 +109,70 @@ def _preprocess_image(img: np.ndarray, pad_value: bool, p: int = 2) -> np.ndarra
     return np.pad(_img, p, mode="constant", constant_values=pad_value)
 
 
-def _get_surrounding_positions(i: int, j: int) -> list[tuple[int, int]]:
-    pos: list[tuple[int, int]] = []
-    for a in range(i - 1, i + 2):
-        for b in range(j - 1, j + 2):
-            pos.append((a, b))
-    return pos
-
+def _trim_zeros(img: np.ndarray) -> np.ndarray:
+    """Remove rows or columns from the edges that are all zeros."""
+    rows, cols = np.nonzero(img)
+    if len(rows) == 0:
+        return img[:0, :0].copy()
+    return img[rows.min() : rows.max() + 1, cols.min() : cols.max() + 1].copy()
 
-def _get_surrounding_values(
-    ary: np.ndarray, i: int, j: int, pad_val: bool
-) -> list[bool]:
-    values: list[bool] = []
-    dims = ary.shape
-    for a, b in _get_surrounding_positions(i, j):
-        if a < 0 or b < 0 or a >= dims[0] or b >= dims[1]:
-            values.append(pad_val)
-        else:
-            values.append(ary[a, b])
-    return values
 
+def _enhance_into(
+    src: np.ndarray, dst: np.ndarray, alg: np.ndarray, pad_val: bool
+) -> bool:
+    """Enhance an image into a preallocated buffer of the same shape.
 
-def _convert_image_values_to_index(vals: list[bool]) -> int:
-    assert len(vals) == 9
-    return int("".join([str(int(x)) for x in vals]), base=2)
+    The outermost ring of pixels in `src` must only hold the value of the infinite
+    background. The same holds for `dst` once it has been written.
 
+    Args:
+        src (np.ndarray): Padded starting image.
+        dst (np.ndarray): Buffer to write the enhanced image into.
+        alg (np.ndarray): Enhancement algorithm.
+        pad_val (bool): Value of the infinite background in `src`.
 
-def _trim_zeros(img: np.ndarray) -> np.ndarray:
-    """Remove rows or columns from the edges that are all zeros."""
-    res = img.copy()
-    for _ in range(4):
-        res = np.rot90(res)
-        for _ in range(res.shape[0]):
-            if np.all(res[0, :] == False):  # noqa: E712
-                res = res[1:, :]
-            else:
-                break
-    return res
+    Returns:
+        bool: Value of the infinite background in `dst`.
+    """
+    # Pack each horizontal triple of pixels once, then stack three neighbouring
+    # rows of triples into the 9-bit index.
+    rows = np.left_shift(src[:, :-2], 2, dtype=np.uint16)
+    rows |= np.left_shift(src[:, 1:-1], 1, dtype=np.uint16)
+    rows |= src[:, 2:]
+    idx = rows[:-2] << 6
+    idx |= rows[1:-1] << 3
+    idx |= rows[2:]
+    # Indices are 9-bit by construction, so skip bounds checks and write the
+    # looked-up pixels straight into the destination buffer.
+    np.take(alg, idx, out=dst[1:-1, 1:-1], mode="clip")
+    new_pad_val = bool(alg[-1] if pad_val else alg[0])
+    dst[[0, -1], :] = new_pad_val
+    dst[:, [0, -1]] = new_pad_val
+    return new_pad_val
 
 
 def enhance_image(
-    img: np.ndarray, alg: list[bool], pad_val: bool = False
+    img: np.ndarray, alg: np.ndarray, pad_val: bool = False
 ) -> np.ndarray:
     """Enhance an image using an algorithm.
 
     Args:
         img (np.ndarray): Starting image.
-        alg (list[bool]): Enhancement algorithm.
+        alg (np.ndarray): Enhancement algorithm.
         pad_val (bool, optional): Value to use for padding. Defaults to False.
 
     Returns:
         np.ndarray: Enhanced image.
     """
-    img = _preprocess_image(img, pad_value=pad_val, p=2)
-    output = np.zeros_like(img, dtype=bool)
-    dims = img.shape
-    for i, j in product(range(dims[0]), range(dims[1])):
-        values = _get_surrounding_values(img, i, j, pad_val=pad_val)
-        idx = _convert_image_values_to_index(values)
-        output[i, j] = alg[idx]
-    return _trim_zeros(output)
+    src = _preprocess_image(img, pad_value=pad_val, p=3)
+    dst = np.empty_like(src)
+    _enhance_into(src, dst, alg, pad_val=pad_val)
+    return _trim_zeros(dst[1:-1, 1:-1])
 
 
 def enhance_image_n(
     img: np.ndarray,
-    alg: list[bool],
+    alg: np.ndarray,
     n: int = 2,
     plot: bool = False,
     video: bool = False,
@@ -174,7 +182,7 @@ def enhance_image_n(
 
     Args:
         img (np.ndarray): Starting image.
-        alg (list[bool]): Enhancement algorithm
+        alg (np.ndarray): Enhancement algorithm
         n (int, optional): Number of iterations. Defaults to 2.
         plot (bool, optional): Should each image be plotted? Defaults to False.
         video (bool, optional): Should the series of enhanced images be compiled into a
@@ -192,22 +200,23 @@ def enhance_image_n(
     if plot:
         plot_image(img, title="Starting image")
 
-    init_pad_value = alg[0]
+    # Pad once for all of the iterations: the image grows by one pixel per side
+    # per enhancement and the outermost ring always holds the background value.
+    front = _preprocess_image(img, pad_value=False, p=n + 1)
+    back = np.empty_like(front)
     pad_val = False
 
     for i in range(n):
-        img = enhance_image(img, alg, pad_val=pad_val)
-
-        if init_pad_value:
-            pad_val = not pad_val
+        pad_val = _enhance_into(front, back, alg, pad_val=pad_val)
+        front, back = back, front
 
         if video:
-            video_imgs.append(img.copy())
+            video_imgs.append(_trim_zeros(front))
         elif plot:
-            plot_image(img.copy(), title=f"Enhancement {i+1}")
+            plot_image(_trim_zeros(front), title=f"Enhancement {i+1}")
     if video:
         plot_video(video_imgs, video_path=video_path)
-    return img
+    return _trim_zeros(front)
 
 
 def main() -> None:
@@ -2,12 +2,12 @@
 
 from __future__ import annotations
 
-from copy import copy
 from dataclasses import dataclass
-from functools import cache
 from itertools import product
 from typing import Counter
 
+import numpy as np
+
 from advent_of_code.checks import check_answer, check_example
 from advent_of_code.cli_output import print_single_answer
 from advent_of_code.data import read_data
@@ -16,20 +16,6 @@ from advent_of_code.utils import PuzzleInfo
 PI = PuzzleInfo(day=21, title="Dirac Dice")
 
 
-@dataclass
-class DeterministicDie:
-    """Deterministic die for Dirac Dice."""
-
-    value: int = 0
-
-    def roll(self) -> int:
-        """Role the die."""
-        if self.value == 100:
-            self.value = 0
-        self.value += 1
-        return self.value
-
-
 @dataclass
 class Player:
     """Player of Dirac Dice."""
@@ -43,9 +29,7 @@ class Player:
         Args:
             n (int): Number of positions to move.
         """
-        self.pos += n
-        while self.pos > 10:
-            self.pos -= 10
+        self.pos = (self.pos - 1 + n) % 10 + 1
         self.score += self.pos
 
     def __hash__(self) -> int:
@@ -65,13 +49,13 @@ def get_players() -> tuple[Player, Player]:
     return p1, p2
 
 
-def _roll_n_times(die: DeterministicDie, n: int = 3) -> int:
-    return sum([die.roll() for _ in range(n)])
-
-
 def play_practice_dirac_dice_game(p1: Player, p2: Player) -> int:
     """Player a practice round of Dirac Dice with a determinitic dice.
 
+    The deterministic die rolls 1, 2, ..., 100 and then wraps around, so after
+    `n_rolls` rolls the next three sum to `3 * n_rolls + 6` less some multiple of
+    100. Only the distance moved modulo 10 matters, so that sum can be used directly.
+
     Args:
         p1 (Player): Player 1.
         p2 (Player): Player 2.
@@ -79,18 +63,13 @@ def play_practice_dirac_dice_game(p1: Player, p2: Player) -> int:
     Returns:
         int: Number of rolls to reach a winner.
     """
-    die = DeterministicDie()
+    players = (p1, p2)
     n_rolls = 0
     while True:
+        player = players[n_rolls // 3 % 2]
+        player.move(3 * n_rolls + 6)
         n_rolls += 3
-        res = _roll_n_times(die)
-        p1.move(res)
-        if p1.score >= 1000:
-            break
-        res = _roll_n_times(die)
-        n_rolls += 3
-        p2.move(res)
-        if p2.score >= 1000:
+        if player.score >= 1000:
             break
     return n_rolls
 
@@ -104,23 +83,36 @@ def _calc_puzzle_result(n_rolls: int, p1: Player, p2: Player) -> int:
 DIRAC_ROLLS = list([sum(x) for x in product(range(1, 4), range(1, 4), range(1, 4))])
 
 
-@cache
-def _all_dirac_outcomes(p1: Player, p2: Player) -> list[tuple[Player, Player]]:
-    games: list[tuple[Player, Player]] = []
-    for p1_rolls, p2_rolls in product(DIRAC_ROLLS, DIRAC_ROLLS):
-        _p1, _p2 = copy(p1), copy(p2)
-        _p1.move(p1_rolls)
-        _p2.move(p2_rolls)
-        games.append((_p1, _p2))
-    return games
+DIRAC_ROLL_COUNTS = Counter(DIRAC_ROLLS)
+WINNING_SCORE = 21
+
+
+def _take_dirac_turn(universes: np.ndarray) -> tuple[np.ndarray, int]:
+    """Take a turn for the player to move in every universe.
+
+    Args:
+        universes (np.ndarray): Number of universes per (position - 1, score) of the
+        player to move followed by that of the other player.
+
+    Returns:
+        tuple[np.ndarray, int]: Number of unfinished universes with the axes swapped
+        so the other player moves next, and the number of universes won this turn.
+    """
+    new_universes = np.zeros_like(universes)
+    wins = 0
+    for roll, n in DIRAC_ROLL_COUNTS.items():
+        for pos in range(10):
+            new_pos = (pos + roll) % 10
+            points = new_pos + 1
+            keep = WINNING_SCORE - points
+            new_universes[new_pos, points:] += n * universes[pos, :keep]
+            wins += n * int(universes[pos, keep:].sum())
+    return new_universes.transpose(2, 3, 0, 1), wins
 
 
 def play_dirac_dice(player1: Player, player2: Player) -> tuple[int, int]:
     """Play the game of Dirac Dice.
 
-    I'm not sure where, but there is a counting error somewhere in my algorithm. Anyway,
-    it seems to be fixed by dividing the number of player 1 wins by 27 (3^3).
-
     Args:
         player1 (Player): Starting position for player 1.
         player2 (Player): Starting position for player 2.
@@ -128,25 +120,16 @@ def play_dirac_dice(player1: Player, player2: Player) -> tuple[int, int]:
     Returns:
         tuple[int, int]: Number of games won by player 1 and player 2.
     """
-    p1_wins, p2_wins = 0, 0
-    games: Counter[tuple[Player, Player]] = Counter([(player1, player2)])
-    while len(games) > 0:
-        new_games: Counter[tuple[Player, Player]] = Counter()
-        for (p1, p2), n in games.items():
-            all_res = _all_dirac_outcomes(p1, p2)
-            unfinished_games: list[tuple[Player, Player]] = []
-            for _p1, _p2 in all_res:
-                if _p1.score >= 21:
-                    p1_wins += n
-                elif _p2.score >= 21:
-                    p2_wins += n
-                else:
-                    unfinished_games.append((_p1, _p2))
-            _new_games = Counter(unfinished_games)
-            _new_games = Counter({k: v * n for k, v in _new_games.items()})
-            new_games += _new_games
-        games = new_games
-    return int(p1_wins / 27), p2_wins
+    shape = (10, WINNING_SCORE, 10, WINNING_SCORE)
+    universes = np.zeros(shape, dtype=np.int64)
+    universes[player1.pos - 1, player1.score, player2.pos - 1, player2.score] = 1
+    wins = [0, 0]
+    turn = 0
+    while universes.any():
+        universes, n_wins = _take_dirac_turn(universes)
+        wins[turn % 2] += n_wins
+        turn += 1
+    return wins[0], wins[1]
 
 
 def main() -> None:
@@ -168,10 +151,9 @@ def main() -> None:
 
     # Part 2.
     # Example.
-    if False:
-        ex_p1, ex_p2 = Player(4), Player(8)
-        ex_wins = play_dirac_dice(ex_p1, ex_p2)
-        check_example((444356092776315, 341960390180808), ex_wins)
+    ex_p1, ex_p2 = Player(4), Player(8)
+    ex_wins = play_dirac_dice(ex_p1, ex_p2)
+    check_example((444356092776315, 341960390180808), ex_wins)
 
     # Real.
     p1, p2 = get_players()
@@ -2,14 +2,12 @@
 
 from __future__ import annotations
 
-from copy import copy, deepcopy
+import heapq
 from dataclasses import dataclass
-from enum import Enum
-from functools import cache
 from itertools import product
-from typing import Any, Final, Optional, Union
+from typing import Final, Iterable, Iterator, Optional
 
-# from advent_of_code.checks import check_answer, check_example
+from advent_of_code.checks import check_answer, check_example
 from advent_of_code.cli_output import print_single_answer
 from advent_of_code.data import read_data
 from advent_of_code.utils import PuzzleInfo
@@ -34,146 +32,105 @@ _example_finished = """
 
 
 N_ROOMS: Final[int] = 4
-ROOM_LEN: int = 2
+ROOM_LENS: Final[tuple[int, ...]] = (2, 4)
 HALLWAY_LEN: Final[int] = 11
 ROOM_TO_HALLWAY: Final[dict[int, int]] = {0: 2, 1: 4, 2: 6, 3: 8}
 
+# Each cell of the burrow is packed into 3 bits of a single integer: 0 for an empty
+# cell or 1-4 for an amphipod of type A-D. The 11 hallway cells come first followed
+# by the rooms, each from bottom to top.
+CELL_BITS: Final[int] = 3
+CELL_MASK: Final[int] = 0b111
+AMPHIPOD_TYPES: Final[str] = ".ABCD"
 
-class AmphipodType(Enum):
 
-    A = "A"
-    B = "B"
-    C = "C"
-    D = "D"
+def _hallway_offset(hallway_pos: int) -> int:
+    return CELL_BITS * hallway_pos
 
 
-class Amphipod:
+def _room_offset(room_i: int, room_pos: int, room_len: int) -> int:
+    return CELL_BITS * (HALLWAY_LEN + room_i * room_len + room_pos)
 
-    atype: AmphipodType
 
-    def __init__(self, atype: Union[str, AmphipodType]) -> None:
-        if isinstance(atype, str):
-            atype = AmphipodType(atype)
-        self.atype = atype
-        return None
+def _get_cell(state: int, offset: int) -> int:
+    return (state >> offset) & CELL_MASK
 
-    def __str__(self) -> str:
-        return self.atype.value
 
-    def __repr__(self) -> str:
-        return str(self)
+def _set_cell(state: int, offset: int, apod: int) -> int:
+    return (state & ~(CELL_MASK << offset)) | (apod << offset)
 
-    def __copy__(self) -> Amphipod:
-        return Amphipod(self.atype)
 
+# The two cell readers below are on the search's hot path, so the offset arithmetic
+# is written out rather than going through the helpers above.
+def _hallway_cell(state: int, hallway_pos: int) -> int:
+    return (state >> (CELL_BITS * hallway_pos)) & CELL_MASK
 
-# index 0: bottom
-# index 1: top
-AmphipodRoom = list[Optional[Amphipod]]
 
+def _room_cell(state: int, room_i: int, room_pos: int, room_len: int) -> int:
+    cell_i = HALLWAY_LEN + room_i * room_len + room_pos
+    return (state >> (CELL_BITS * cell_i)) & CELL_MASK
 
+
+@dataclass(frozen=True)
 class AmphipodBurrow:
 
-    rooms: tuple[AmphipodRoom, AmphipodRoom, AmphipodRoom, AmphipodRoom]
-    hallway: list[Optional[Amphipod]]
-    _room_len: int
-
-    def __init__(
-        self,
-        A: AmphipodRoom,
-        B: AmphipodRoom,
-        C: AmphipodRoom,
-        D: AmphipodRoom,
-        hallway: Optional[list[Optional[Amphipod]]] = None,
-        room_len: int = 2,
-    ) -> None:
-        self._room_len = room_len
-        # for x in (A, B, C, D):
-        #     assert len(x) == room_len
-        self.rooms = (A, B, C, D)
-
-        if hallway is not None:
-            self.hallway = hallway
-        else:
-            self.hallway = [None] * 11
-        return None
+    __slots__ = ("state", "room_len")
+
+    state: int
+    room_len: int
+
+    @classmethod
+    def from_cells(cls, hallway: str, rooms: list[str]) -> AmphipodBurrow:
+        """Build a burrow from the hallway and rooms (bottom to top) as letters."""
+        room_len = len(rooms[0])
+        state = 0
+        for hallway_pos, apod in enumerate(hallway):
+            offset = _hallway_offset(hallway_pos)
+            state = _set_cell(state, offset, AMPHIPOD_TYPES.index(apod))
+        for room_i, room in enumerate(rooms):
+            for room_pos, apod in enumerate(room):
+                offset = _room_offset(room_i, room_pos, room_len)
+                state = _set_cell(state, offset, AMPHIPOD_TYPES.index(apod))
+        return cls(state, room_len=room_len)
 
     def __str__(self) -> str:
         out = "".join(
-            [str(x) if isinstance(x, Amphipod) else "." for x in self.hallway]
+            AMPHIPOD_TYPES[_get_cell(self.state, _hallway_offset(i))]
+            for i in range(HALLWAY_LEN)
         )
         out += "\n"
-        for i in reversed(range(self._room_len)):
+        for i in reversed(range(self.room_len)):
             row = "  "
-            for room in self.rooms:
-                apod = room[i]
-                row += apod.atype.value if apod is not None else "."
-                row += " "
+            for room_i in range(N_ROOMS):
+                offset = _room_offset(room_i, i, self.room_len)
+                row += AMPHIPOD_TYPES[_get_cell(self.state, offset)] + " "
             out += row + "\n"
         return out
 
     def __repr__(self) -> str:
         return str(self)
 
-    def __hash__(self) -> int:
-        return hash(str(self))
-
-    def __eq__(self, a: Any) -> bool:
-        return str(self) == str(a)
-
-    def __copy__(self) -> AmphipodBurrow:
-        a, b, c, d = (deepcopy(x) for x in self.rooms)
-        return AmphipodBurrow(
-            A=a, B=b, C=c, D=d, hallway=deepcopy(self.hallway), room_len=self._room_len
-        )
-
-    @property
-    def is_complete(self) -> bool:
-        if not all([x is None for x in self.hallway]):
-            return False
-        for atype, aroom in zip(AmphipodType, self.rooms):
-            if not all([a is not None and a.atype is atype for a in aroom]):
-                return False
-        return True
-
 
-def _amphipod_list(*args: str) -> AmphipodRoom:
-    return [None if a == "." else Amphipod(a) for a in args]
+def _goal_state(room_len: int) -> int:
+    state = 0
+    for room_i, room_pos in product(range(N_ROOMS), range(room_len)):
+        state = _set_cell(state, _room_offset(room_i, room_pos, room_len), room_i + 1)
+    return state
 
 
 # D#C#B#A#
 # D#B#A#C#
-PART2_ADDITIONS: Final[list[tuple[str, str]]] = [
-    ("D", "D"),
-    ("C", "B"),
-    ("B", "A"),
-    ("A", "C"),
-]
-
-
-def _convert_for_part2(aburrow: AmphipodBurrow) -> None:
-    aburrow._room_len = 4
-    for room_i, atypes in enumerate(PART2_ADDITIONS):
-        for atype in atypes:
-            aburrow.rooms[room_i].insert(1, Amphipod(atype))
-    return None
+PART2_ADDITIONS: Final[list[str]] = ["DCBA", "DBAC"]
 
 
 def parse_puzzle_input(data: str, part: int) -> AmphipodBurrow:
     data_list = data.strip().splitlines()
-    hallway = [
-        None if x == "." else Amphipod(x) for x in data_list[1].strip().replace("#", "")
-    ]
-    row1 = list(data_list[2].strip().replace("#", ""))
-    row2 = list(data_list[3].strip().replace("#", ""))
-    A = _amphipod_list(row2[0], row1[0])
-    B = _amphipod_list(row2[1], row1[1])
-    C = _amphipod_list(row2[2], row1[2])
-    D = _amphipod_list(row2[3], row1[3])
-    apod = AmphipodBurrow(A, B, C, D, hallway=hallway)
+    hallway = data_list[1].strip().replace("#", "")
+    rows = [line.strip().replace("#", "") for line in data_list[2:4]]
     if part == 2:
-        _convert_for_part2(apod)
-    return apod
+        rows = [rows[0], *PART2_ADDITIONS, rows[1]]
+    rooms = ["".join(row[i] for row in reversed(rows)) for i in range(N_ROOMS)]
+    return AmphipodBurrow.from_cells(hallway, rooms)
 
 
 def _get_example_puzzle(part: int = 1) -> AmphipodBurrow:
@@ -188,262 +145,238 @@ def _get_puzzle_input(part: int = 1) -> AmphipodBurrow:
     return parse_puzzle_input(read_data(PI.day), part)
 
 
-@dataclass
-class MoveResult:
-
-    aburrow: AmphipodBurrow
-    score: int
-
-
-@cache
-def _move_distance(room_i: int, room_pos: int, hallway_i: int) -> int:
+def _move_distance(room_i: int, room_pos: int, hallway_i: int, room_len: int) -> int:
     x = abs(hallway_i - (2 * (1 + room_i)))
-    x += ROOM_LEN - room_pos
+    x += room_len - room_pos
     return x
 
 
-AMPHIPOD_ENERGY: Final[dict[AmphipodType, int]] = {
-    AmphipodType.A: 1,
-    AmphipodType.B: 10,
-    AmphipodType.C: 100,
-    AmphipodType.D: 1000,
+# Number of steps between a room position and a hallway position, indexed by the
+# room length, room, room position, and hallway position.
+MOVE_DISTANCES: Final[dict[int, tuple[tuple[tuple[int, ...], ...], ...]]] = {
+    room_len: tuple(
+        tuple(
+            tuple(_move_distance(r, p, h, room_len) for h in range(HALLWAY_LEN))
+            for p in range(room_len)
+        )
+        for r in range(N_ROOMS)
+    )
+    for room_len in ROOM_LENS
 }
 
-AMPHIPOD_DEST_ROOM: Final[dict[AmphipodType, int]] = {
-    AmphipodType.A: 0,
-    AmphipodType.B: 1,
-    AmphipodType.C: 2,
-    AmphipodType.D: 3,
-}
+
+# Indexed by amphipod cell value.
+AMPHIPOD_ENERGY: Final[tuple[int, ...]] = (0, 1, 10, 100, 1000)
+AMPHIPOD_DEST_ROOM: Final[tuple[int, ...]] = (-1, 0, 1, 2, 3)
 
 
-def _can_reach_hallway_position_from_room(
-    aburrow: AmphipodBurrow, room_i: int, hallway_pos: int
-) -> bool:
+def _hallway_mask(positions: Iterable[int]) -> int:
+    mask = 0
+    for hallway_pos in positions:
+        mask |= CELL_MASK << _hallway_offset(hallway_pos)
+    return mask
+
+
+def _room_to_hallway_mask(room_i: int, hallway_pos: int) -> int:
     start = ROOM_TO_HALLWAY[room_i]
-    if hallway_pos == start:
-        return False
-    elif hallway_pos < start:
-        return all([a is None for a in aburrow.hallway[hallway_pos : (start + 1)]])
-    else:
-        end = min(HALLWAY_LEN, hallway_pos + 1)
-        return all([a is None for a in aburrow.hallway[start:end]])
-
-
-def _can_reach_room_from_hallway_pos(
-    aburrow: AmphipodBurrow, room_i: int, hallway_pos: int
-) -> bool:
+    return _hallway_mask(range(min(start, hallway_pos), max(start, hallway_pos) + 1))
+
+
+def _hallway_to_room_mask(room_i: int, hallway_pos: int) -> int:
     end = ROOM_TO_HALLWAY[room_i]
-    if end == hallway_pos:
-        return True
     if end < hallway_pos:
-        return all([a is None for a in aburrow.hallway[end:hallway_pos]])
-    else:
-        start = hallway_pos + 1
-        end += 1
-        return all([a is None for a in aburrow.hallway[start:end]])
-
-
-def _apod_is_in_destination(apod: Amphipod, room: AmphipodRoom, room_i: int) -> bool:
-    if room_i != AMPHIPOD_DEST_ROOM[apod.atype]:  # in wrong room number
-        return False
-    idx = room.index(apod)
-    for neighbor in room[0:idx]:  # check all below are same type
-        assert neighbor is not None
-        if neighbor.atype != apod.atype:
-            return False
-    return True
-
-
-def pop_top_to_hallway(
-    aburrow: AmphipodBurrow,
-    room_i: int,
-    hallway_pos: int,
-    allow_atop_room: bool = False,
-) -> int:
-    if not allow_atop_room and hallway_pos in {2, 4, 6, 8}:
-        return 0
-    if aburrow.hallway[hallway_pos] is not None:
-        # Position in hallway is taken.
-        return 0
-    aroom = aburrow.rooms[room_i]
-    if all([a is None for a in aroom]):
-        # No amphipods in the room.
-        return 0
-    if not _can_reach_hallway_position_from_room(aburrow, room_i, hallway_pos):
-        return 0
-    score: int = 0
-    for i in reversed(range(ROOM_LEN)):
-        if (apod := aroom[i]) is not None:
-            if _apod_is_in_destination(apod, aroom, room_i=room_i):
-                return 0
-            aburrow.hallway[hallway_pos] = apod
-            aroom[i] = None
-            score = _move_distance(room_i, i, hallway_pos) * AMPHIPOD_ENERGY[apod.atype]
-            return score
-    print(aburrow)
-    raise BaseException("Unforeseen possibility of moving amphipod.")
+        return _hallway_mask(range(end, hallway_pos))
+    return _hallway_mask(range(hallway_pos + 1, end + 1))
+
+
+# Hallway cells that must be empty to move between a room and a hallway position.
+ROOM_TO_HALLWAY_MASKS: Final[tuple[tuple[int, ...], ...]] = tuple(
+    tuple(_room_to_hallway_mask(r, h) for h in range(HALLWAY_LEN))
+    for r in range(N_ROOMS)
+)
+HALLWAY_TO_ROOM_MASKS: Final[tuple[tuple[int, ...], ...]] = tuple(
+    tuple(_hallway_to_room_mask(r, h) for h in range(HALLWAY_LEN))
+    for r in range(N_ROOMS)
+)
+
+# Amphipods never stop in the hallway directly outside a room.
+HALLWAY_STOPS: Final[tuple[int, ...]] = tuple(
+    h for h in range(HALLWAY_LEN) if h not in ROOM_TO_HALLWAY.values()
+)
+
+# For each room, every hallway position an amphipod may stop at as a tuple of the
+# position, the hallway cells that must be empty to get there (itself included), and
+# the distance along the hallway.
+ROOM_TO_HALLWAY_MOVES: Final[tuple[tuple[tuple[int, int, int], ...], ...]] = tuple(
+    tuple(
+        (h, ROOM_TO_HALLWAY_MASKS[r][h], abs(h - ROOM_TO_HALLWAY[r]))
+        for h in HALLWAY_STOPS
+    )
+    for r in range(N_ROOMS)
+)
 
 
-def _which_space_in_room(dest_room: AmphipodRoom) -> Optional[int]:
-    for i, apod in enumerate(dest_room):
-        if apod is None:
-            return i
-    return None
+def _room_contents(state: int, room_i: int, room_len: int) -> int:
+    """All cells of a room as a single integer."""
+    offset = CELL_BITS * (HALLWAY_LEN + room_i * room_len)
+    return (state >> offset) & ((1 << (CELL_BITS * room_len)) - 1)
 
 
-def _room_is_all_correct_type_or_none(atype: AmphipodType, aroom: AmphipodRoom) -> bool:
-    for apod in aroom:
-        if apod is not None and apod.atype != atype:
-            return False
-    return True
-
-
-def try_moving_rooms(aburrow: AmphipodBurrow, room_i: int) -> int:
-    """Try moving each amphipod from a room to another and return the energy."""
-    for room_pos in (1, 0):
-        if (apod := aburrow.rooms[room_i][room_pos]) is not None:
-            room_dest_i = AMPHIPOD_DEST_ROOM[apod.atype]
-            if not _room_is_all_correct_type_or_none(
-                apod.atype, aburrow.rooms[room_dest_i]
-            ):
-                return 0
-            room_dest_pos = _which_space_in_room(aburrow.rooms[room_dest_i])
-            if room_dest_pos is None:
-                # No space in destination room.
-                return 0
-            hallway_pos = ROOM_TO_HALLWAY[room_dest_i]
-            score = pop_top_to_hallway(
-                aburrow, room_i=room_i, hallway_pos=hallway_pos, allow_atop_room=True
-            )
-            if score == 0:
-                # Unable to move apod to above its destination.
-                return 0
-            score += try_moving_from_hallway_to_room(aburrow, hallway_pos)
-            return score
-    # No amphipods to move.
-    return 0
-
-
-def try_moving_from_hallway_to_room(aburrow: AmphipodBurrow, hallway_pos: int) -> int:
-    """Try moving an amphipod from the hallway to a room and return the energy."""
-    if (apod := aburrow.hallway[hallway_pos]) is None:
-        return 0
-    dest_room_i = AMPHIPOD_DEST_ROOM[apod.atype]
-    dest_room_pos = _which_space_in_room(aburrow.rooms[dest_room_i])
-    if dest_room_pos is None:
-        return 0
-    if not _room_is_all_correct_type_or_none(apod.atype, aburrow.rooms[dest_room_i]):
-        return 0
-    if not _can_reach_room_from_hallway_pos(
-        aburrow, room_i=dest_room_i, hallway_pos=hallway_pos
-    ):
-        return 0
-    aburrow.hallway[hallway_pos] = None
-    aburrow.rooms[dest_room_i][dest_room_pos] = apod
-    n_moves = _move_distance(
-        room_i=dest_room_i, room_pos=dest_room_pos, hallway_i=hallway_pos
-    )
-    return n_moves * AMPHIPOD_ENERGY[apod.atype]
+def _settled_room_contents(room_len: int) -> tuple[dict[int, int], ...]:
+    """Room contents holding only amphipods that belong there.
 
+    For each room, maps the contents (see `_room_contents()`) to the number of
+    amphipods in the room, which is also the position the next one will move into.
+    """
+    settled = []
+    for room_i in range(N_ROOMS):
+        contents: dict[int, int] = {}
+        room = 0
+        for n_apods in range(room_len + 1):
+            contents[room] = n_apods
+            room |= (room_i + 1) << (CELL_BITS * n_apods)
+        settled.append(contents)
+    return tuple(settled)
 
-def move_amphipods_to_destination(aburrow: AmphipodBurrow) -> int:
-    _prev_burrow: str = ""
-    score = 0
-    while _prev_burrow != str(aburrow):
-        _prev_burrow = str(aburrow)
-        for hallway_pos in range(HALLWAY_LEN):
-            score += try_moving_from_hallway_to_room(aburrow, hallway_pos)
-        for room_i in range(N_ROOMS):
-            score += try_moving_rooms(aburrow, room_i)
-    return score
 
+SETTLED_ROOMS: Final[dict[int, tuple[dict[int, int], ...]]] = {
+    room_len: _settled_room_contents(room_len) for room_len in ROOM_LENS
+}
+HALLWAY_STOPS_MASK: Final[int] = _hallway_mask(HALLWAY_STOPS)
 
-def _empty_hallway_positions(aburrow: AmphipodBurrow) -> list[int]:
-    return [
-        i
-        for i, x in enumerate(aburrow.hallway)
-        if x is None and x not in ROOM_TO_HALLWAY.values()
-    ]
+
+def _top_of_room(state: int, room_i: int, room_len: int) -> Optional[int]:
+    for room_pos in reversed(range(room_len)):
+        if _room_cell(state, room_i, room_pos, room_len) != 0:
+            return room_pos
+    return None
 
 
-def make_all_moves(aburrow: AmphipodBurrow, scores: list[int], score: int = 0) -> None:
-    if aburrow.is_complete:
-        return None
-    for room, hallway_pos in product(range(N_ROOMS), _empty_hallway_positions(aburrow)):
-        copy_aburrow = copy(aburrow)
-        res = pop_top_to_hallway(copy_aburrow, room, hallway_pos)
-        res += move_amphipods_to_destination(copy_aburrow)
-        # print(copy_aburrow)
-        # continue
-        if res == 0:
+def move_amphipods_to_destination(state: int, room_len: int) -> tuple[int, int]:
+    """Move every amphipod that can go straight into its destination room.
+
+    Only settled rooms (holding nothing but amphipods that belong there) accept
+    amphipods and those rooms never need to be emptied, so their fill level is
+    tracked while moving instead of re-scanning the room cells on every pass.
+    """
+    settled_rooms = SETTLED_ROOMS[room_len]
+    move_distance = MOVE_DISTANCES[room_len]
+    fills = [
+        settled_rooms[r].get(_room_contents(state, r, room_len)) for r in range(N_ROOMS)
+    ]
+    score = 0
+    moved = True
+    while moved:
+        moved = False
+        # No need to scan the hallway once all of it has moved into the rooms.
+        hallway_stops = HALLWAY_STOPS if state & HALLWAY_STOPS_MASK else ()
+        for hallway_pos in hallway_stops:
+            if (apod := _hallway_cell(state, hallway_pos)) == 0:
+                continue
+            dest_room_i = AMPHIPOD_DEST_ROOM[apod]
+            if (dest_room_pos := fills[dest_room_i]) is None:
+                continue
+            if (state & HALLWAY_TO_ROOM_MASKS[dest_room_i][hallway_pos]) != 0:
+                continue
+            state = _set_cell(state, _hallway_offset(hallway_pos), 0)
+            state = _set_cell(
+                state, _room_offset(dest_room_i, dest_room_pos, room_len), apod
+            )
+            fills[dest_room_i] = dest_room_pos + 1
+            n_moves = move_distance[dest_room_i][dest_room_pos][hallway_pos]
+            score += n_moves * AMPHIPOD_ENERGY[apod]
+            moved = True
+        for room_i in range(N_ROOMS):
+            if fills[room_i] is not None:
+                continue
+            room_pos = _top_of_room(state, room_i, room_len)
+            assert room_pos is not None  # an empty room is always settled
+            apod = _room_cell(state, room_i, room_pos, room_len)
+            dest_room_i = AMPHIPOD_DEST_ROOM[apod]
+            if (dest_room_pos := fills[dest_room_i]) is None:
+                continue
+            hallway_pos = ROOM_TO_HALLWAY[dest_room_i]
+            if (state & ROOM_TO_HALLWAY_MASKS[room_i][hallway_pos]) != 0:
+                continue
+            state = _set_cell(state, _room_offset(room_i, room_pos, room_len), 0)
+            state = _set_cell(
+                state, _room_offset(dest_room_i, dest_room_pos, room_len), apod
+            )
+            fills[room_i] = settled_rooms[room_i].get(
+                _room_contents(state, room_i, room_len)
+            )
+            fills[dest_room_i] = dest_room_pos + 1
+            n_moves = move_distance[room_i][room_pos][hallway_pos]
+            n_moves += move_distance[dest_room_i][dest_room_pos][hallway_pos]
+            score += n_moves * AMPHIPOD_ENERGY[apod]
+            moved = True
+    return state, score
+
+
+def _next_states(state: int, room_len: int) -> Iterator[tuple[int, int]]:
+    """Burrows reachable by moving one amphipod into the hallway.
+
+    Any amphipods that can then move into their destination rooms are moved too.
+    """
+    settled_rooms = SETTLED_ROOMS[room_len]
+    for room_i in range(N_ROOMS):
+        if _room_contents(state, room_i, room_len) in settled_rooms[room_i]:
             continue
-        new_score = score + res
-        if len(scores) > 0 and min(scores) <= new_score:
-            # End early if a faster solution has been found.
-            return
-        if copy_aburrow.is_complete:
-            scores.append(new_score)
-            print(f"completion score: {new_score}")
-            return
-        else:
-            make_all_moves(aburrow=copy_aburrow, scores=scores, score=new_score)
-    return None
+        room_pos = _top_of_room(state, room_i, room_len)
+        assert room_pos is not None  # an empty room is always settled
+        apod = _room_cell(state, room_i, room_pos, room_len)
+        lifted = _set_cell(state, _room_offset(room_i, room_pos, room_len), 0)
+        climb = room_len - room_pos
+        for hallway_pos, mask, distance in ROOM_TO_HALLWAY_MOVES[room_i]:
+            if (state & mask) != 0:
+                continue
+            new_state = lifted | (apod << _hallway_offset(hallway_pos))
+            new_state, dest_res = move_amphipods_to_destination(new_state, room_len)
+            yield new_state, (climb + distance) * AMPHIPOD_ENERGY[apod] + dest_res
 
 
 def find_lowest_rearrange_score(aburrow: AmphipodBurrow) -> int:
-    scores: list[int] = []
-    make_all_moves(aburrow, scores)
-    return min(scores)
+    """Find the least energy needed to organize the amphipods using Dijkstra's."""
+    goal = _goal_state(aburrow.room_len)
+    start, start_score = move_amphipods_to_destination(aburrow.state, aburrow.room_len)
+    best: dict[int, int] = {start: start_score}
+    queue: list[tuple[int, int]] = [(start_score, start)]
+    while len(queue) > 0:
+        score, state = heapq.heappop(queue)
+        if state == goal:
+            return score
+        if score > best[state]:
+            continue
+        for new_state, energy in _next_states(state, aburrow.room_len):
+            new_score = score + energy
+            if new_state not in best or new_score < best[new_state]:
+                best[new_state] = new_score
+                heapq.heappush(queue, (new_score, new_state))
+    raise BaseException("Unable to organize the amphipods.")
 
 
 def main() -> None:
     """Run code for 'Day 23: Amphipod'."""
     # Part 1.
     # Example.
-    # ex_burrow = _get_example_puzzle()
-    # print("Starting configuration:")
-    # print(ex_burrow)
-    # print("-" * 80)
-    # ex_scores: list[int] = []
-    # make_all_moves(ex_burrow, ex_scores)
-    # print(f"number of scores: {len(ex_scores)}")
-    # print(f"min score: {min(ex_scores)}")
-    # check_example(12521, min(ex_scores))
+    ex_burrow = _get_example_puzzle()
+    check_example(12521, find_lowest_rearrange_score(ex_burrow))
 
     # Real.
-    # burrow = _get_puzzle_input()
-    # scores: list[int] = []
-    # make_all_moves(burrow, scores)
-    # print_single_answer(PI.day, 1, min(scores))
-    # check_answer(15472, min(scores), day=PI.day, part=1)
+    burrow = _get_puzzle_input()
+    min_score = find_lowest_rearrange_score(burrow)
+    print_single_answer(PI.day, 1, min_score)
+    check_answer(15472, min_score, day=PI.day, part=1)
 
     # Part 2.
     # Examples.
-    global ROOM_LEN
-    ROOM_LEN = 4
-    # ex_burrow = _get_example_puzzle(part=2)
-    # print("Starting configuration:")
-    # print(ex_burrow)
-    # print("-" * 80)
-    # ex_scores: list[int] = []
-    # make_all_moves(ex_burrow, ex_scores)
-    # print(f"number of scores: {len(ex_scores)}")
-    # print(f"min score: {min(ex_scores)}")
-    # check_example(12521, min(ex_scores))
+    ex_burrow = _get_example_puzzle(part=2)
+    check_example(44169, find_lowest_rearrange_score(ex_burrow))
 
     # Real.
     burrow = _get_puzzle_input(part=2)
-    print(burrow)
-    scores: list[int] = []
-    make_all_moves(burrow, scores)
-    print(f"number of scores: {len(scores)}")
-    min_score = min(scores)
-    print(f"min score: {min_score}")
+    min_score = find_lowest_rearrange_score(burrow)
     print_single_answer(PI.day, 2, min_score)
-    # check_answer(15472, min_score, day=PI.day, part=1)
-    # 46444 too high
-
     return None
 
 
@@ -1,18 +1,32 @@
 """Day 24: Arithmetic Logic Unit."""
 
-from typing import Optional, Protocol, Union
+from typing import Final, Optional, Protocol, Union
 
 # from advent_of_code.checks import check_answer, check_example
-# from advent_of_code.cli_output import print_single_answer
+from advent_of_code.cli_output import print_single_answer
 from advent_of_code.data import read_data
 from advent_of_code.utils import PuzzleInfo
 
 PI = PuzzleInfo(day=24, title="Arithmetic Logic Unit")
 
+# Values of the ALU variables w, x, y, and z.
+Registers = tuple[int, int, int, int]
+REGISTERS: Final[str] = "wxyz"
+Z: Final[int] = REGISTERS.index("z")
+
+# Opcodes of compiled ALU instructions.
+INP, ADD, MUL, DIV, MOD, EQL = range(6)
+
+# Compiled instruction: opcode, register `a`, whether `b` is a register, and `b`.
+CompiledInstruction = tuple[int, int, bool, int]
+
 
 class ALUInstruction(Protocol):
     """ALU Instruction protocol."""
 
+    opcode: int
+    a: str
+
     def __call__(self, input: int, vars: dict[str, int]) -> None:
         """Run the operation with inputs and variables."""
         ...
@@ -29,6 +43,9 @@ def _try_convert_b_to_int(b: Union[str, int]) -> Union[str, int]:
 
 class ALUInp:
 
+    __slots__ = ("a",)
+
+    opcode: int = INP
     a: str
 
     def __init__(self, a: str) -> None:
@@ -48,6 +65,9 @@ class ALUInp:
 
 class ALUAdd:
 
+    __slots__ = ("a", "b")
+
+    opcode: int = ADD
     a: str
     b: Union[str, int]
 
@@ -73,6 +93,9 @@ class ALUAdd:
 
 class ALUMul:
 
+    __slots__ = ("a", "b")
+
+    opcode: int = MUL
     a: str
     b: Union[str, int]
 
@@ -98,6 +121,9 @@ class ALUMul:
 
 class ALUDiv:
 
+    __slots__ = ("a", "b")
+
+    opcode: int = DIV
     a: str
     b: Union[str, int]
 
@@ -124,6 +150,9 @@ class ALUDiv:
 
 class ALUMod:
 
+    __slots__ = ("a", "b")
+
+    opcode: int = MOD
     a: str
     b: Union[str, int]
 
@@ -150,6 +179,9 @@ class ALUMod:
 
 class ALUEql:
 
+    __slots__ = ("a", "b")
+
+    opcode: int = EQL
     a: str
     b: Union[str, int]
 
@@ -172,28 +204,62 @@ class ALUEql:
         return str(self)
 
 
-def _hash_dict(d: dict[str, int]) -> int:
-    return hash(frozenset(d.items()))
+def _compile_instruction(instruction: ALUInstruction) -> CompiledInstruction:
+    a = REGISTERS.index(instruction.a)
+    if isinstance(instruction, ALUInp):
+        return instruction.opcode, a, False, 0
+    assert isinstance(instruction, (ALUAdd, ALUMul, ALUDiv, ALUMod, ALUEql))
+    if isinstance(instruction.b, str):
+        return instruction.opcode, a, True, REGISTERS.index(instruction.b)
+    return instruction.opcode, a, False, instruction.b
+
+
+def _run_program(
+    program: list[CompiledInstruction], input: int, registers: Registers
+) -> Registers:
+    regs = list(registers)
+    for opcode, a, b_is_register, b in program:
+        val = regs[b] if b_is_register else b
+        if opcode == INP:
+            regs[a] = input
+        elif opcode == ADD:
+            regs[a] += val
+        elif opcode == MUL:
+            regs[a] *= val
+        elif opcode == DIV:
+            assert val > 0, f"Cannot perform division operation: a: {regs[a]}, b: {val}"
+            regs[a] //= val
+        elif opcode == MOD:
+            assert (
+                regs[a] >= 0 and val > 0
+            ), f"Cannot perform modulo operation: a: {regs[a]}, b: {val}"
+            regs[a] %= val
+        else:
+            regs[a] = int(regs[a] == val)
+    w, x, y, z = regs
+    return w, x, y, z
 
 
 class ArithmeticLogicUnit:
 
     instructions: list[ALUInstruction]
-    _cache: dict[tuple[int, int], dict[str, int]]
+    program: list[CompiledInstruction]
 
     def __init__(self, instructions: list[ALUInstruction]) -> None:
         self.instructions = instructions.copy()
-        self._cache = {}.copy()  # type: ignore
+        self.program = [_compile_instruction(i) for i in instructions]
         return None
 
-    def run(self, input: int, vars: dict[str, int]) -> dict[str, int]:
-        _key = (input, _hash_dict(vars))
-        if _key in self._cache:
-            return self._cache[_key].copy()
-        for instruction in self.instructions:
-            instruction(input=input, vars=vars)
-        self._cache[_key] = vars.copy()
-        return vars
+    def run(self, input: int, registers: Registers) -> Registers:
+        return _run_program(self.program, input=input, registers=registers)
+
+    def run_block(self, z: int, digit: int) -> int:
+        """Run a MONAD block and return the new value of `z`.
+
+        Each block reads `w` from the input and resets `x` and `y` before using them,
+        so `z` is the only state carried between blocks.
+        """
+        return self.run(digit, registers=(0, 0, 0, z))[Z]
 
     def __str__(self) -> str:
         msg = ""
@@ -246,47 +312,109 @@ def get_split_alus() -> list[ArithmeticLogicUnit]:
     return alus
 
 
-def _print_dict(d: dict[str, int]) -> None:
-    msg = ""
-    for k, v in d.items():
-        msg += f"{k}: {v} "
-    print(msg)
+# Coefficients of a MONAD block: `div z a`, `add x b`, and `add y c`.
+MonadCoeffs = tuple[int, int, int]
+
+# Position, opcode, and register `a` of the instructions holding the coefficients
+# within each MONAD block.
+_MONAD_COEFF_LINES: Final[tuple[tuple[int, int, int], ...]] = (
+    (4, DIV, Z),
+    (5, ADD, REGISTERS.index("x")),
+    (15, ADD, REGISTERS.index("y")),
+)
+
+
+def extract_monad_coeffs(alus: list[ArithmeticLogicUnit]) -> list[MonadCoeffs]:
+    """Pull the block-specific constants out of each MONAD block.
+
+    Apart from these three integers every block is the same program, which boils
+    down to: `x = z % 26 + b != w`, `z //= a`, and then `z = 26 * z + w + c` if `x`.
+    """
+    coeffs: list[MonadCoeffs] = []
+    for alu in alus:
+        values: list[int] = []
+        for line, expected_opcode, register in _MONAD_COEFF_LINES:
+            opcode, a, b_is_register, b = alu.program[line]
+            if opcode != expected_opcode or a != register or b_is_register:
+                raise BaseException(
+                    f"Unexpected MONAD instruction: {alu.program[line]}"
+                )
+            values.append(b)
+        a, b, c = values
+        coeffs.append((a, b, c))
+    return coeffs
 
 
 def step(
-    alus: list[ArithmeticLogicUnit], k: int, vars: dict[str, int]
-) -> Optional[int]:
-    for val in reversed(range(1, 10)):
-        res = alus[k].run(val, vars=vars.copy())
-        if k in {0, 1, 2, 3}:
-            print(f"@ k={k}: {val}")
-        if k == 13:
-            if res["z"] == 0:
-                return val
+    coeffs: list[MonadCoeffs],
+    k: int,
+    z: int,
+    digits: range,
+    z_bounds: list[int],
+    dead_ends: set[tuple[int, int]],
+) -> Optional[str]:
+    if k == len(coeffs):
+        return "" if z == 0 else None
+    if z >= z_bounds[k] or (k, z) in dead_ends:
+        return None
+    a, b, c = coeffs[k]
+    for digit in digits:
+        if z % 26 + b == digit:
+            new_z = z // a
         else:
-            res_k1 = step(alus, k=k + 1, vars=res)
-            if res_k1 is not None:
-                return int(f"{val}{res_k1}")
+            new_z = z // a * 26 + digit + c
+        if (
+            rest := step(coeffs, k + 1, new_z, digits, z_bounds, dead_ends)
+        ) is not None:
+            return f"{digit}{rest}"
+    dead_ends.add((k, z))
     return None
 
 
-def find_largest_valid_monad_number() -> Optional[int]:
-    alus = get_split_alus()
-    monad = step(alus, k=0, vars={"w": 0, "x": 0, "y": 0, "z": 0})
-    return monad
+def _find_valid_monad_number(digits: range) -> int:
+    coeffs = extract_monad_coeffs(get_split_alus())
+    # A block can only shrink `z` by integer division, so if `z` is at least the
+    # product of the divisors of the remaining blocks, it can never get back to 0.
+    z_bounds = [1] * len(coeffs)
+    bound = 1
+    for k in reversed(range(len(coeffs))):
+        bound *= coeffs[k][0]
+        z_bounds[k] = bound
+    monad = step(coeffs, k=0, z=0, digits=digits, z_bounds=z_bounds, dead_ends=set())
+    if monad is None:
+        raise BaseException("No valid model number found.")
+    return int(monad)
+
+
+def run_monad(alus: list[ArithmeticLogicUnit], model_number: int) -> int:
+    """Run MONAD on a model number with the ALU and return the final value of `z`."""
+    z = 0
+    for alu, digit in zip(alus, str(model_number)):
+        z = alu.run_block(z, int(digit))
+    return z
+
+
+def find_largest_valid_monad_number() -> int:
+    return _find_valid_monad_number(digits=range(9, 0, -1))
+
+
+def find_smallest_valid_monad_number() -> int:
+    return _find_valid_monad_number(digits=range(1, 10))
 
 
 def main() -> None:
     """Run code for 'Day 24: Arithmetic Logic Unit'."""
+    alus = get_split_alus()
+
     # Part 1.
     largest_model_num = find_largest_valid_monad_number()
-    print(f"answer: {largest_model_num}")
-    # print_single_answer(day=PI.day, part=1, value=largest_model_num)
-    # 82708914944990 too low
+    print_single_answer(day=PI.day, part=1, value=largest_model_num)
+    assert run_monad(alus, largest_model_num) == 0
 
     # Part 2.
-    # smallest_model_num = find_smallest_valid_monad_number()
-    # print_single_answer(day=PI.day, part=2, value=smallest_model_num)
+    smallest_model_num = find_smallest_valid_monad_number()
+    print_single_answer(day=PI.day, part=2, value=smallest_model_num)
+    assert run_monad(alus, smallest_model_num) == 0
     return None
 
 
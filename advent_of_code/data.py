@@ -26,9 +26,7 @@ def read_data(day: int, name: str = "input.txt") -> str:
     Returns:
         str: The puzzle input as a string.
     """
-    with open(get_data_path(day=day, name=name), "r") as file:
-        data = "".join(line for line in file)
-    return data
+    return get_data_path(day=day, name=name).read_text()
 
 
 def output_dir() -> Path: